@@ -0,0 +1,63 @@
+import gc
+import multiprocessing
+import os
+import resource
+import time
+
+started_at = time.perf_counter()
+
+bind = os.environ.get('WATER_QUALITY_BIND', '127.0.0.1:8000')
+workers = int(os.environ.get('WATER_QUALITY_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+pidfile = os.environ.get('WATER_QUALITY_PIDFILE', 'gunicorn.pid')
+timeout = 30
+graceful_timeout = 30
+
+# Import wsgi.py in the master so the app, mappers and schemas are shared with workers
+preload_app = os.environ.get('WATER_QUALITY_PRELOAD', 'true').lower() == 'true'
+
+
+def memory_usage_kb():
+    # Resident memory of the current process in kilobytes, split into pages
+    # still shared with the parent and pages private to this process.
+    # Kept here so the master doesn't import the app unless it preloads it.
+    try:
+        with open('/proc/self/smaps_rollup') as rollup:
+            fields = dict(line.split()[:2] for line in rollup if line.split()[0].endswith(':'))
+        shared = int(fields['Shared_Clean:']) + int(fields['Shared_Dirty:'])
+        private = int(fields['Private_Clean:']) + int(fields['Private_Dirty:'])
+        return {'rss': int(fields['Rss:']), 'shared': shared, 'private': private}
+    except (OSError, KeyError):
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return {'rss': rss, 'shared': None, 'private': None}
+
+
+def when_ready(server):
+    # Runs before the first worker is forked. Freezing moves everything the
+    # master allocated out of the collector's reach, so GC passes in the
+    # workers don't write to the shared pages.
+    gc.collect()
+    gc.freeze()
+
+    server.log.info(f"Master ready in {time.perf_counter() - started_at:.4f}s, "
+                    f"preload_app={server.cfg.preload_app}, rss_kb={memory_usage_kb()['rss']}")
+
+
+def post_fork(server, worker):
+    if server.cfg.preload_app:
+        import wsgi
+        from webapp.serving import dispose_engine
+
+        dispose_engine(wsgi.app)
+
+
+def post_worker_init(worker):
+    # Measured once the app is loaded, whether it came from the master or not
+    memory = memory_usage_kb()
+    worker.log.info(f"Worker {worker.pid} ready, rss_kb={memory['rss']}, "
+                    f"shared_kb={memory['shared']}, private_kb={memory['private']}")
+
+
+def on_reload(server):
+    # SIGHUP only replaces the workers, which fork from the master's already
+    # loaded app. Deploying new code needs the re-exec done by serve.py reload.
+    server.log.info("Restarting workers")
@@ -0,0 +1,68 @@
+import argparse
+import os
+import signal
+import sys
+import time
+
+base_dir = os.path.abspath(os.path.dirname(__file__))
+
+
+def read_pid(path):
+    with open(path) as pidfile:
+        return int(pidfile.read().strip())
+
+
+def start(args):
+    if args.bind:
+        os.environ['WATER_QUALITY_BIND'] = args.bind
+    if args.workers:
+        os.environ['WATER_QUALITY_WORKERS'] = str(args.workers)
+    os.environ['WATER_QUALITY_PIDFILE'] = os.path.abspath(args.pidfile)
+    os.execvp('gunicorn', ['gunicorn', '--chdir', base_dir,
+                           '--config', os.path.join(base_dir, 'gunicorn.conf.py'), 'wsgi:app'])
+
+
+def reload(args):
+    # SIGHUP would only re-fork workers from the master's already loaded app,
+    # so new code is deployed by re-executing the master instead. USR2 starts
+    # a new master that loads the code and writes <pidfile>.2 once it is ready,
+    # then TERM gracefully retires the old master and its workers.
+    old_pid = read_pid(args.pidfile)
+    os.kill(old_pid, signal.SIGUSR2)
+
+    deadline = time.monotonic() + args.timeout
+    while time.monotonic() < deadline:
+        try:
+            new_pid = read_pid(args.pidfile + '.2')
+            break
+        except (OSError, ValueError):
+            time.sleep(0.2)
+    else:
+        sys.exit(f"New master did not start within {args.timeout}s, master {old_pid} keeps serving")
+
+    os.kill(old_pid, signal.SIGTERM)
+    print(f"Master {new_pid} is serving the new code, master {old_pid} is shutting down")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the Water Quality API with multiple workers")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    default_pidfile = os.path.join(base_dir, 'gunicorn.pid')
+
+    start_parser = subparsers.add_parser('start', help="Start the pre-forking server")
+    start_parser.add_argument('--bind', help="Address to listen on, e.g. 0.0.0.0:8000")
+    start_parser.add_argument('--workers', type=int, help="Number of worker processes")
+    start_parser.add_argument('--pidfile', default=default_pidfile)
+    start_parser.set_defaults(func=start)
+
+    reload_parser = subparsers.add_parser('reload', help="Load new code without dropping connections")
+    reload_parser.add_argument('--pidfile', default=default_pidfile)
+    reload_parser.add_argument('--timeout', type=float, default=30, help="Seconds to wait for the new master")
+    reload_parser.set_defaults(func=reload)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
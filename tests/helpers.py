@@ -0,0 +1,12 @@
+from webapp.validation import FEATURE_COLUMNS
+
+HEADER = ','.join(['Unnamed: 0'] + FEATURE_COLUMNS + ['Training', 'Location ID', 'Date'])
+
+
+def make_row(date_text, value='0.5', training='True'):
+    return ['0'] + [value] * len(FEATURE_COLUMNS) + [training, '2198840', date_text]
+
+
+def write_csv(path, rows):
+    path.write_text('\n'.join([HEADER] + [','.join(row) for row in rows]) + '\n')
+    return str(path)
@@ -0,0 +1,91 @@
+import json
+from datetime import date
+
+from webapp import db
+from webapp.ingest import ingest_csv_file
+from webapp.models import LatestReading, QuarantinedRow, WaterQualityData
+from tests.helpers import make_row, write_csv
+
+
+def test_ingest_csv_file(client, tmp_path):
+    csv_file = write_csv(tmp_path / '2198840.csv', [
+        make_row('2016-01-28'),
+        make_row('2016-01-30', value='1.5'),
+        make_row('2016-01-29') + ['extra'],
+        make_row('2016-01-31'),
+    ])
+
+    summary = ingest_csv_file(csv_file, 2198840)
+
+    assert summary == {
+        'file': csv_file,
+        'rows': 4,
+        'accepted': 2,
+        'skipped': 0,
+        'rejected': 2,
+        'reasons': {'out_of_range': 1, 'wrong_field_count': 1},
+    }
+    stored = WaterQualityData.query.filter_by(location_id=2198840).order_by(WaterQualityData.date).all()
+    assert [reading.date for reading in stored] == [date(2016, 1, 28), date(2016, 1, 31)]
+    assert stored[0].water_quality == 0.5
+    assert stored[0].training is True
+
+    # Row numbers are lines in the file, the header being line 1
+    quarantined = QuarantinedRow.query.order_by(QuarantinedRow.row_number).all()
+    assert [(row.row_number, row.reason) for row in quarantined] == [(3, 'out_of_range'), (4, 'wrong_field_count')]
+    assert json.loads(quarantined[1].data) == make_row('2016-01-29') + ['extra']
+
+    latest = db.session.get(LatestReading, 2198840)
+    assert latest.date == date(2016, 1, 31)
+    assert latest.data_id == stored[1].id
+
+
+def test_ingest_csv_file_rerun_skips_stored_rows(client, tmp_path):
+    csv_file = write_csv(tmp_path / '2198840.csv', [
+        make_row('2016-01-28'),
+        make_row('2016-01-29', value='1.5'),
+        make_row('2016-01-30'),
+    ])
+    ingest_csv_file(csv_file, 2198840)
+
+    summary = ingest_csv_file(csv_file, 2198840)
+
+    assert summary['accepted'] == 0
+    assert summary['skipped'] == 2
+    assert summary['reasons'] == {'out_of_range': 1}
+    assert WaterQualityData.query.count() == 2
+    quarantined = QuarantinedRow.query.all()
+    assert [(row.row_number, row.reason) for row in quarantined] == [(3, 'out_of_range')]
+
+
+def test_ingest_csv_file_empty_file(client, tmp_path):
+    csv_file = tmp_path / '2198840.csv'
+    csv_file.write_text('')
+
+    summary = ingest_csv_file(str(csv_file), 2198840)
+
+    assert summary['rows'] == 0
+    assert db.session.get(LatestReading, 2198840) is None
+
+
+def test_ingest_maintains_latest_reading(client, tmp_path):
+    ingest_csv_file(write_csv(tmp_path / 'first.csv', [make_row('2016-01-28'), make_row('2016-02-05')]), 2198840)
+    newest = WaterQualityData.query.filter_by(date=date(2016, 2, 5)).one()
+
+    latest = db.session.get(LatestReading, 2198840)
+    assert latest.data_id == newest.id
+    assert latest.date == date(2016, 2, 5)
+
+    # A back-dated second batch leaves the snapshot where it was
+    summary = ingest_csv_file(write_csv(tmp_path / 'second.csv', [make_row('2016-01-29'), make_row('2016-01-30')]),
+                              2198840)
+    assert summary['accepted'] == 2
+
+    latest = db.session.get(LatestReading, 2198840)
+    assert latest.data_id == newest.id
+    assert latest.date == date(2016, 2, 5)
+
+    ingest_csv_file(write_csv(tmp_path / 'third.csv', [make_row('2016-02-06')]), 2198840)
+
+    latest = db.session.get(LatestReading, 2198840)
+    assert latest.date == date(2016, 2, 6)
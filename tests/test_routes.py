@@ -1,4 +1,4 @@
-from webapp.models import User,WaterQualityData, Location
+from webapp.models import User,WaterQualityData, Location, LatestReading
 from webapp import db
 import json
 from datetime import datetime
@@ -204,4 +204,137 @@ def test_get_prediction_endpoint(client):
     response = client.get(f'/predictions/{prediction_id}', headers={'Authorization': f'Bearer {access_token}'})
     
     assert response.status_code == 200
-    assert response.json == {"message": f"Details for prediction {prediction_id}"}
\ No newline at end of file
+    assert response.json == {"message": f"Details for prediction {prediction_id}"}
+
+
+def add_reading(location, date, water_quality):
+    reading = WaterQualityData(
+        location=location,
+        date=datetime.strptime(date, '%Y-%m-%d').date(),
+        water_quality=water_quality,
+    )
+    db.session.add(reading)
+    db.session.flush()
+    LatestReading.track(reading)
+    db.session.commit()
+    return reading
+
+# Test for the '/locations/latest' endpoint
+def test_latest_readings_endpoint(client):
+    first = Location(location_name='First Station', latitude=1.0, longitude=2.0)
+    second = Location(location_name='Second Station', latitude=3.0, longitude=4.0)
+    db.session.add_all([first, second])
+    db.session.commit()
+
+    add_reading(first, '2022-02-20', 0.1)
+    newest = add_reading(first, '2022-02-22', 0.2)
+    add_reading(first, '2022-02-21', 0.3)  # Back-dated reading
+    add_reading(second, '2022-03-01', 0.4)
+
+    add_test_user(client)
+    access_token = login(client, "newuser", "password123")
+
+    response = client.get('/locations/latest', headers={'Authorization': f'Bearer {access_token}'})
+
+    assert response.status_code == 200
+    assert [item['location_id'] for item in response.json] == [first.location_id, second.location_id]
+    assert response.json[0]['date'] == '2022-02-22'
+    assert response.json[0]['reading']['id'] == newest.id
+    assert response.json[0]['reading']['water_quality'] == 0.2
+    assert 'location' not in response.json[0]
+
+    response_with_location = client.get('/locations/latest?include_location=true',
+                                        headers={'Authorization': f'Bearer {access_token}'})
+
+    assert response_with_location.status_code == 200
+    assert response_with_location.json[1]['location']['location_name'] == 'Second Station'
+
+
+def test_update_water_quality_keeps_latest_reading(client):
+    location = Location(location_name='Test Location', latitude=0.0, longitude=0.0)
+    db.session.add(location)
+    db.session.commit()
+
+    newest = add_reading(location, '2022-02-22', 0.5)
+    add_reading(location, '2022-02-21', 0.5)
+
+    add_test_user(client)
+    access_token = login(client, "newuser", "password123")
+
+    # Back-dated edit leaves the snapshot on the newest row
+    response = client.put(f'/water-quality/2022-02-21/{location.location_id}',
+                          json={"water_quality": 0.9},
+                          headers={'Authorization': f'Bearer {access_token}'})
+    assert response.status_code == 200
+
+    response = client.put(f'/water-quality/2022-02-22/{location.location_id}',
+                          json={"water_quality": 0.7},
+                          headers={'Authorization': f'Bearer {access_token}'})
+    assert response.status_code == 200
+
+    response_latest = client.get('/locations/latest', headers={'Authorization': f'Bearer {access_token}'})
+    assert response_latest.json[0]['reading']['id'] == newest.id
+    assert response_latest.json[0]['reading']['water_quality'] == 0.7
+
+
+def test_update_water_quality_without_snapshot(client):
+    location = Location(location_name='Test Location', latitude=0.0, longitude=0.0)
+    db.session.add(location)
+    # Loaded before latest_readings existed, so there is no snapshot row
+    newest = WaterQualityData(location=location, date=datetime(2022, 2, 22).date())
+    older = WaterQualityData(location=location, date=datetime(2022, 2, 21).date())
+    db.session.add_all([newest, older])
+    db.session.commit()
+
+    add_test_user(client)
+    access_token = login(client, "newuser", "password123")
+
+    response = client.put(f'/water-quality/2022-02-21/{location.location_id}',
+                          json={"water_quality": 0.9},
+                          headers={'Authorization': f'Bearer {access_token}'})
+    assert response.status_code == 200
+
+    latest = db.session.get(LatestReading, location.location_id)
+    assert latest.data_id == newest.id
+    assert latest.date == datetime(2022, 2, 22).date()
+
+
+def test_track_ignores_stale_snapshot_in_session(client):
+    location = Location(location_name='Test Location', latitude=0.0, longitude=0.0)
+    db.session.add(location)
+    db.session.commit()
+    add_reading(location, '2022-02-20', 0.1)
+
+    # This session still holds the snapshot at 2022-02-20 while another
+    # worker moves it to a newer reading
+    stale = db.session.get(LatestReading, location.location_id)
+    newer = WaterQualityData(location=location, date=datetime(2022, 2, 22).date())
+    db.session.add(newer)
+    db.session.flush()
+    db.session.execute(db.update(LatestReading)
+                       .values(data_id=newer.id, date=newer.date)
+                       .execution_options(synchronize_session=False))
+    assert stale.date == datetime(2022, 2, 20).date()
+
+    add_reading(location, '2022-02-21', 0.3)
+
+    latest = db.session.get(LatestReading, location.location_id)
+    assert latest.data_id == newer.id
+    assert latest.date == datetime(2022, 2, 22).date()
+
+
+def test_rebuild_latest_readings(client):
+    location = Location(location_name='Test Location', latitude=0.0, longitude=0.0)
+    db.session.add(location)
+    db.session.add_all([
+        WaterQualityData(location=location, date=datetime(2022, 2, 20).date()),
+        WaterQualityData(location=location, date=datetime(2022, 2, 23).date()),
+        WaterQualityData(location=location, date=datetime(2022, 2, 21).date()),
+    ])
+    db.session.commit()
+
+    assert LatestReading.rebuild() == 1
+    db.session.commit()
+
+    latest = db.session.get(LatestReading, location.location_id)
+    assert latest.date == datetime(2022, 2, 23).date()
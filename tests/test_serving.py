@@ -0,0 +1,67 @@
+import os
+import re
+import signal
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from webapp import create_app, db
+from webapp.serving import dispose_engine
+
+WORKERS = 2
+repo_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def boot_gunicorn(tmp_path, preload):
+    # Start a real server from a fresh interpreter and collect the private
+    # memory every worker logs once its app is loaded
+    env = dict(os.environ, WATER_QUALITY_PRELOAD=str(preload).lower(), WATER_QUALITY_WORKERS=str(WORKERS),
+               WATER_QUALITY_BIND='127.0.0.1:0', WATER_QUALITY_PIDFILE=str(tmp_path / f'gunicorn-{preload}.pid'))
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '--config', os.path.join(repo_dir, 'gunicorn.conf.py'),
+         '--pythonpath', repo_dir, 'wsgi:app'],
+        cwd=tmp_path, env=env, stderr=subprocess.PIPE, text=True,
+    )
+    watchdog = threading.Timer(60, server.kill)
+    watchdog.start()
+    private_kb, master_ready = [], False
+    try:
+        for line in server.stderr:
+            master_ready = master_ready or 'Master ready' in line
+            match = re.search(r'Worker \d+ ready, .*private_kb=(\d+)', line)
+            if match:
+                private_kb.append(int(match.group(1)))
+            if len(private_kb) == WORKERS:
+                break
+    finally:
+        watchdog.cancel()
+        server.send_signal(signal.SIGTERM)
+        server.communicate(timeout=30)
+    assert master_ready
+    assert len(private_kb) == WORKERS
+    return private_kb
+
+
+def test_dispose_engine_replaces_pool(tmp_path):
+    app = create_app("sqlite:///" + str(tmp_path / 'pool.sqlite'))
+    with app.app_context():
+        pool = db.engine.pool
+
+    dispose_engine(app)
+
+    with app.app_context():
+        assert db.engine.pool is not pool
+
+
+@pytest.mark.skipif(not os.path.exists('/proc/self/smaps_rollup'), reason="requires smaps_rollup")
+def test_preloaded_workers_share_memory(tmp_path):
+    pytest.importorskip('gunicorn')
+
+    cold = boot_gunicorn(tmp_path, preload=False)
+    preloaded = boot_gunicorn(tmp_path, preload=True)
+
+    # Workers that inherit the app from the master only hold what they
+    # dirtied since the fork, workers that import it themselves hold all of it
+    assert sum(preloaded) / WORKERS < sum(cold) / WORKERS / 2
@@ -0,0 +1,106 @@
+from datetime import date
+
+import pandas as pd
+
+from webapp.validation import FEATURE_COLUMNS, read_batch, summarise, validate_batch
+from tests.helpers import HEADER, make_row
+
+
+def make_batch(rows):
+    return pd.DataFrame(rows, columns=range(16), dtype=object)
+
+
+def test_validate_batch_accepts_clean_rows():
+    raw = make_batch([make_row('2016-01-28'), make_row('2016-01-29', training='False')])
+
+    clean, rejected, skipped = validate_batch(raw, 2198840)
+
+    assert len(rejected) == 0
+    assert len(skipped) == 0
+    assert list(clean.columns) == ['location_id', 'date'] + FEATURE_COLUMNS + ['training']
+    assert clean['date'].tolist() == [date(2016, 1, 28), date(2016, 1, 29)]
+    assert clean['training'].tolist() == [True, False]
+    assert (clean['location_id'] == 2198840).all()
+
+
+def test_validate_batch_rejects_with_reason_codes():
+    raw = make_batch([
+        make_row('2016-01-28'),
+        make_row('not-a-date'),
+        make_row('2016-01-30', value='abc'),
+        make_row('2016-01-31', training='maybe'),
+        make_row('2016-02-01', value='1.5'),
+        make_row('2016-01-28'),
+        make_row('2016-02-02'),
+    ])
+    stored = pd.DataFrame([[date(2016, 2, 2)] + [0.25] * len(FEATURE_COLUMNS) + [True]],
+                          columns=['date'] + FEATURE_COLUMNS + ['training'])
+
+    clean, rejected, skipped = validate_batch(raw, 2198840, stored)
+
+    assert clean['date'].tolist() == [date(2016, 1, 28)]
+    assert rejected['reason'].tolist() == [
+        'invalid_date', 'invalid_number', 'invalid_training', 'out_of_range', 'duplicate', 'duplicate',
+    ]
+    assert rejected['data'].iloc[0] == make_row('not-a-date')
+    assert summarise('test.csv', clean, rejected, skipped) == {
+        'file': 'test.csv',
+        'rows': 7,
+        'accepted': 1,
+        'skipped': 0,
+        'rejected': 6,
+        'reasons': {
+            'duplicate': 2, 'invalid_date': 1, 'invalid_number': 1, 'invalid_training': 1, 'out_of_range': 1,
+        },
+    }
+
+
+def test_validate_batch_keeps_first_valid_duplicate():
+    raw = make_batch([make_row('2016-01-28', value='-1'), make_row('2016-01-28')])
+
+    clean, rejected, skipped = validate_batch(raw, 2198840)
+
+    assert clean.index.tolist() == [1]
+    assert rejected['reason'].tolist() == ['out_of_range']
+
+
+def test_validate_batch_skips_rows_already_stored():
+    raw = make_batch([make_row('2016-01-28'), make_row('2016-01-29')])
+    stored = pd.DataFrame([[date(2016, 1, 28)] + [0.5] * len(FEATURE_COLUMNS) + [True]],
+                          columns=['date'] + FEATURE_COLUMNS + ['training'])
+
+    clean, rejected, skipped = validate_batch(raw, 2198840, stored)
+
+    assert skipped.tolist() == [0]
+    assert clean['date'].tolist() == [date(2016, 1, 29)]
+    assert len(rejected) == 0
+
+
+def test_read_batch_rejects_wrong_field_count(tmp_path):
+    csv_file = tmp_path / '2198840.csv'
+    csv_file.write_text('\n'.join([
+        HEADER,
+        ','.join(make_row('2016-01-28')),
+        ','.join(make_row('2016-01-29') + ['extra']),
+        ','.join(make_row('2016-01-30')[:10]),
+        ','.join(make_row('2016-01-31')),
+    ]) + '\n')
+
+    raw, wrong_width = read_batch(csv_file)
+
+    assert raw.index.tolist() == [2, 5]
+    assert wrong_width.index.tolist() == [3, 4]
+    assert wrong_width['reason'].tolist() == ['wrong_field_count', 'wrong_field_count']
+    assert wrong_width['data'].iloc[0][-1] == 'extra'
+
+
+def test_read_batch_empty_file(tmp_path):
+    csv_file = tmp_path / '2198840.csv'
+    csv_file.write_text('')
+
+    raw, wrong_width = read_batch(csv_file)
+    clean, rejected, skipped = validate_batch(raw, 2198840)
+
+    assert len(raw) == 0
+    assert len(wrong_width) == 0
+    assert summarise(str(csv_file), clean, rejected, skipped)['rows'] == 0
@@ -51,4 +51,11 @@ def create_app(database_uri=None):
         db.create_all()
         print('Initialised the database.')
 
+    @app.cli.command('rebuild-latest')
+    def rebuild_latest_command():
+        from webapp.models import LatestReading
+        count = LatestReading.rebuild()
+        db.session.commit()
+        print(f'Rebuilt latest readings for {count} locations.')
+
     return app
@@ -0,0 +1,52 @@
+import json
+
+import pandas as pd
+
+from webapp import db
+from webapp.models import LatestReading, QuarantinedRow, WaterQualityData
+from webapp.validation import FEATURE_COLUMNS, read_batch, summarise, validate_batch
+
+
+def stored_readings(location_id):
+    columns = ['date'] + FEATURE_COLUMNS + ['training']
+    rows = db.session.execute(
+        db.select(*(getattr(WaterQualityData, column) for column in columns)).filter_by(location_id=location_id)
+    ).all()
+    return pd.DataFrame(rows, columns=columns)
+
+
+def ingest_csv_file(csv_file_path, location_id):
+    """Validate one CSV file, store its clean rows and quarantine the rest.
+
+    Runs inside the caller's app context and commits once per file.
+    Returns a summary of accepted, skipped and rejected rows.
+    """
+    raw, wrong_width = read_batch(csv_file_path)
+    clean, rejected, skipped = validate_batch(raw, location_id, stored_readings(location_id))
+    rejected = pd.concat([wrong_width, rejected]).sort_index()
+
+    if len(clean):
+        db.session.execute(db.insert(WaterQualityData), clean.to_dict('records'))
+        newest_entry = db.session.execute(
+            db.select(WaterQualityData)
+            .filter_by(location_id=location_id, date=clean['date'].max())
+            .order_by(WaterQualityData.id.desc())
+        ).scalars().first()
+        LatestReading.track(newest_entry)
+
+    # A re-run replaces this file's quarantine instead of adding another copy
+    db.session.execute(db.delete(QuarantinedRow).filter_by(source_file=csv_file_path))
+    if len(rejected):
+        db.session.execute(db.insert(QuarantinedRow), [
+            {
+                'source_file': csv_file_path,
+                'row_number': line,
+                'location_id': location_id,
+                'reason': reason,
+                'data': json.dumps(values),
+            }
+            for line, reason, values in zip(rejected.index, rejected['reason'], rejected['data'])
+        ])
+    db.session.commit()
+
+    return summarise(csv_file_path, clean, rejected, skipped)
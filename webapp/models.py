@@ -1,4 +1,5 @@
 from webapp import db
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from werkzeug.security import generate_password_hash, check_password_hash
 
 class User(db.Model):
@@ -62,6 +63,7 @@ class VisualisationData(db.Model):
 
 class WaterQualityData(db.Model):
     __tablename__ = 'water_quality_data'
+    __table_args__ = (db.Index('ix_water_quality_data_location_date', 'location_id', 'date'),)
 
     id = db.Column(db.Integer, primary_key=True)
     location_id = db.Column(db.Integer, db.ForeignKey('locations.location_id'), nullable=False)
@@ -86,6 +88,81 @@ class WaterQualityData(db.Model):
     def __repr__(self):
         return f'<WaterQualityData id={self.id}, Location ID={self.location_id}, Date={self.date}>'
 
+class QuarantinedRow(db.Model):
+    __tablename__ = 'quarantined_rows'
+
+    id = db.Column(db.Integer, primary_key=True)
+    source_file = db.Column(db.String, nullable=False)
+    row_number = db.Column(db.Integer, nullable=False)
+    location_id = db.Column(db.Integer, nullable=True)
+    reason = db.Column(db.String, nullable=False)
+    data = db.Column(db.String, nullable=False)
+
+    def __repr__(self):
+        return f'<QuarantinedRow {self.source_file}:{self.row_number} reason={self.reason}>'
+
+class LatestReading(db.Model):
+    __tablename__ = 'latest_readings'
+
+    location_id = db.Column(db.Integer, db.ForeignKey('locations.location_id'), primary_key=True)
+    data_id = db.Column(db.Integer, db.ForeignKey('water_quality_data.id'), nullable=False)
+    date = db.Column(db.Date, nullable=False)
+
+    reading = db.relationship('WaterQualityData')
+    location = db.relationship('Location')
+
+    def __repr__(self):
+        return f'<LatestReading Location ID={self.location_id}, Date={self.date}>'
+
+    @classmethod
+    def track(cls, reading):
+        # Must run in the same transaction as the write to the reading. Each
+        # case is a single conditional statement so that concurrent workers
+        # can't move the snapshot backwards or race to insert it, and
+        # back-dated readings leave it untouched.
+        moved = db.session.execute(
+            db.update(cls)
+            .where(cls.location_id == reading.location_id, cls.date <= reading.date)
+            .values(data_id=reading.id, date=reading.date)
+            .execution_options(synchronize_session=False)
+        )
+        if moved.rowcount:
+            return
+
+        # Either the snapshot is newer, or there is none yet, e.g. data loaded
+        # before this table existed. Upsert the newest stored row, which is
+        # never a back-dated one.
+        newest = (
+            db.select(WaterQualityData.location_id, WaterQualityData.id, WaterQualityData.date)
+            .filter_by(location_id=reading.location_id)
+            .order_by(WaterQualityData.date.desc(), WaterQualityData.id.desc())
+            .limit(1)
+        )
+        upsert = sqlite_insert(cls).from_select(['location_id', 'data_id', 'date'], newest)
+        db.session.execute(upsert.on_conflict_do_update(
+            index_elements=[cls.location_id],
+            set_={'data_id': upsert.excluded.data_id, 'date': upsert.excluded.date},
+            where=cls.date <= upsert.excluded.date,
+        ))
+
+    @classmethod
+    def rebuild(cls):
+        # Full scan, only needed to backfill the table for existing data
+        newest = db.select(
+            WaterQualityData.location_id,
+            db.func.max(WaterQualityData.date).label('date')
+        ).group_by(WaterQualityData.location_id).subquery()
+        rows = db.session.execute(
+            db.select(WaterQualityData.location_id, db.func.max(WaterQualityData.id), newest.c.date)
+            .join(newest, db.and_(WaterQualityData.location_id == newest.c.location_id,
+                                  WaterQualityData.date == newest.c.date))
+            .group_by(WaterQualityData.location_id, newest.c.date)
+        ).all()
+        db.session.execute(db.delete(cls))
+        db.session.add_all(cls(location_id=location_id, data_id=data_id, date=date)
+                           for location_id, data_id, date in rows)
+        return len(rows)
+
 # Back populates defined outside of classes to avoid circular import issues
 UploadedData.visualisation_data = db.relationship('VisualisationData', uselist=False, back_populates='upload')
 Location.visualisation_data = db.relationship('VisualisationData', back_populates='location')
\ No newline at end of file
@@ -1,8 +1,9 @@
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import get_jwt_identity, jwt_required, create_access_token
 from . import db  
-from .models import User, WaterQualityData, Location
-from .schemas import LocationSchema, UserSchema, UploadedDataSchema, VisualisationDataSchema, WaterQualityDataSchema,WaterQualityUpdateDataSchema
+from .models import User, WaterQualityData, Location, LatestReading
+from .schemas import LocationSchema, UserSchema, UploadedDataSchema, VisualisationDataSchema, WaterQualityDataSchema,WaterQualityUpdateDataSchema, LatestReadingSchema
+from sqlalchemy.orm import joinedload
 from datetime import datetime
 from marshmallow import ValidationError
 
@@ -16,6 +17,8 @@ user_schema = UserSchema()
 uploaded_data_schema = UploadedDataSchema()
 visualisation_data_schema = VisualisationDataSchema()
 water_quality_data_schema = WaterQualityDataSchema()
+latest_readings_schema = LatestReadingSchema(many=True)
+latest_readings_without_location_schema = LatestReadingSchema(many=True, exclude=("location",))
 
 @api_bp.route('/')
 def home():
@@ -190,8 +193,23 @@ def update_water_quality(date, location_id):
         water_quality_data.water_quality = data['water_quality']
     if 'training' in data:
         water_quality_data.training = data['training']
+    LatestReading.track(water_quality_data)
     db.session.commit()
     return jsonify({'message': 'Water quality record updated successfully'}), 200
 
-        
 
+@api_bp.route('/locations/latest', methods=['GET'])
+@jwt_required()
+def get_latest_readings():
+    include_location = request.args.get('include_location', 'false').lower() == 'true'
+
+    # Primary key joins only, no scan over water_quality_data
+    query = db.select(LatestReading).options(joinedload(LatestReading.reading))
+    if include_location:
+        query = query.options(joinedload(LatestReading.location))
+        schema = latest_readings_schema
+    else:
+        schema = latest_readings_without_location_schema
+    latest_readings = db.session.execute(query.order_by(LatestReading.location_id)).scalars().all()
+
+    return jsonify(schema.dump(latest_readings)), 200
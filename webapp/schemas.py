@@ -1,5 +1,5 @@
 from webapp import ma
-from webapp.models import Location, User, UploadedData, VisualisationData, WaterQualityData
+from webapp.models import LatestReading, Location, User, UploadedData, VisualisationData, WaterQualityData
 from marshmallow import fields
 
 class LocationSchema(ma.SQLAlchemyAutoSchema):
@@ -40,6 +40,15 @@ class WaterQualityDataSchema(ma.SQLAlchemyAutoSchema):
     location = fields.Nested(LocationSchema)
 
 
+class LatestReadingSchema(ma.SQLAlchemyAutoSchema):
+    class Meta:
+        model = LatestReading
+        include_fk = True
+
+    reading = fields.Nested(WaterQualityDataSchema(exclude=("location",)))
+    location = fields.Nested(LocationSchema)
+
+
 class WaterQualityUpdateDataSchema(ma.Schema):
     spec_cond_max = fields.Float(allow_none=True)
     ph_max = fields.Float(allow_none=True)
@@ -0,0 +1,8 @@
+from webapp import db
+
+
+def dispose_engine(app, close=False):
+    # After a fork the child must not reuse the parent's pooled connections.
+    # close=False drops them from the pool without closing the parent's sockets.
+    with app.app_context():
+        db.engine.dispose(close=close)
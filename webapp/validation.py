@@ -0,0 +1,113 @@
+import csv
+
+import pandas as pd
+
+# Normalised feature columns in the order they appear in data/*.csv
+FEATURE_COLUMNS = [
+    'spec_cond_max', 'ph_max', 'ph_min', 'spec_cond_min', 'spec_cond_mean',
+    'dissolved_oxy_max', 'dissolved_oxy_mean', 'dissolved_oxy_min',
+    'temp_mean', 'temp_min', 'temp_max', 'water_quality',
+]
+TRAINING_COLUMN = 13
+DATE_COLUMN = 15
+FIELD_COUNT = DATE_COLUMN + 1
+
+# Checked in this order, a rejected row carries the first reason that applies.
+# Duplicate detection runs last on the rows that passed every other check.
+REASON_CODES = ['wrong_field_count', 'invalid_date', 'invalid_number', 'invalid_training',
+                'out_of_range', 'duplicate']
+
+
+def rejected_frame(line_numbers, reasons, values):
+    # Rejected rows keep their original fields, indexed by line in the file
+    return pd.DataFrame({'reason': list(reasons), 'data': list(values)},
+                        index=pd.Index(list(line_numbers), name='line'))
+
+
+def read_batch(csv_file_path):
+    """Read a CSV file as text, indexed by line number.
+
+    Returns the rows with the expected number of fields and the rows that
+    have too few or too many, which are rejected as ``wrong_field_count``.
+    Empty files give an empty batch.
+    """
+    rows, line_numbers, malformed = [], [], []
+    with open(csv_file_path, newline='') as csvfile:
+        reader = csv.reader(csvfile)
+        next(reader, None)  # Skip the header row
+        for row in reader:
+            if len(row) == FIELD_COUNT:
+                rows.append(row)
+                line_numbers.append(reader.line_num)
+            elif row:
+                malformed.append((reader.line_num, row))
+
+    raw = pd.DataFrame(rows, columns=range(FIELD_COUNT), index=pd.Index(line_numbers, name='line'), dtype=object)
+    wrong_width = rejected_frame([line for line, _ in malformed], ['wrong_field_count'] * len(malformed),
+                                 [row for _, row in malformed])
+    return raw, wrong_width
+
+
+def validate_batch(raw, location_id, stored=None):
+    """Split a raw CSV batch into clean records, rejected rows and skipped rows.
+
+    ``stored`` holds the rows already in the database for this location, with
+    a ``date`` column, the feature columns and ``training``. Rows identical to
+    a stored row are skipped so that re-running an upload is a no-op.
+
+    Returns the clean rows as a DataFrame with WaterQualityData column names,
+    the rejected rows with a ``reason`` and their original fields, and the
+    index of the skipped rows.
+    """
+    features = raw.iloc[:, 1:1 + len(FEATURE_COLUMNS)].apply(pd.to_numeric, errors='coerce')
+    features.columns = FEATURE_COLUMNS
+    dates = pd.to_datetime(raw[DATE_COLUMN], format='%Y-%m-%d', errors='coerce')
+    training = raw[TRAINING_COLUMN].str.strip().str.lower()
+
+    checks = {
+        'invalid_date': dates.isna(),
+        'invalid_number': features.isna().any(axis=1),
+        'invalid_training': ~training.isin(['true', 'false']),
+        'out_of_range': ((features < 0) | (features > 1)).any(axis=1),
+    }
+
+    reason = pd.Series('', index=raw.index, dtype=object)
+    for code in REASON_CODES[1:-1]:
+        reason = reason.mask((reason == '') & checks[code], code)
+    passing = reason == ''
+
+    candidates = features.assign(date=dates.dt.date, training=training == 'true')
+    if stored is None:
+        stored = pd.DataFrame(columns=['date'] + FEATURE_COLUMNS + ['training'])
+    matched = candidates[passing].reset_index(names='row').merge(stored, on=['date'] + FEATURE_COLUMNS + ['training'])
+    already_stored = passing & raw.index.isin(matched['row'])
+    passing &= ~already_stored
+
+    # Duplicates are only looked for among otherwise valid rows, so the first
+    # good reading for a date is the one that is kept
+    candidate_dates = dates.where(passing)
+    duplicate = passing & (
+        candidate_dates.duplicated(keep='first') | candidate_dates.dt.date.isin(list(stored['date']))
+    )
+    reason = reason.mask(duplicate, 'duplicate')
+    rejected_mask = reason != ''
+    clean_mask = ~rejected_mask & ~already_stored
+
+    clean = candidates.loc[clean_mask, FEATURE_COLUMNS].copy()
+    clean.insert(0, 'date', candidates.loc[clean_mask, 'date'])
+    clean.insert(0, 'location_id', location_id)
+    clean['training'] = candidates.loc[clean_mask, 'training']
+
+    rejected = rejected_frame(raw.index[rejected_mask], reason[rejected_mask], raw[rejected_mask].values.tolist())
+    return clean, rejected, raw.index[already_stored]
+
+
+def summarise(source, clean, rejected, skipped):
+    return {
+        'file': source,
+        'rows': len(clean) + len(skipped) + len(rejected),
+        'accepted': len(clean),
+        'skipped': len(skipped),
+        'rejected': len(rejected),
+        'reasons': rejected['reason'].value_counts().to_dict() if len(rejected) else {},
+    }
@@ -0,0 +1,4 @@
+from webapp import create_app
+
+# Built once in the master process when the server preloads this module
+app = create_app()